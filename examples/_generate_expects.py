@@ -2,6 +2,7 @@ import io
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import redirect_stdout
 
 import poml
@@ -17,6 +18,25 @@ def process_example(example_content, output_file, context):
     )
 
 
+def _process_one(example_file):
+    """
+    Generate the expected output for a single example file.
+    """
+    examples_dir = os.path.abspath(os.path.dirname(__file__))
+    expect_dir = os.path.join(examples_dir, "expects")
+    context_file = os.path.join(examples_dir, example_file.replace(".poml", ".context.json"))
+    if os.path.exists(context_file):
+        context = json.load(open(context_file))
+    else:
+        context = None
+    process_example(
+        os.path.join(examples_dir, example_file),
+        os.path.join(expect_dir, example_file.replace(".poml", ".txt")),
+        context,
+    )
+    return example_file
+
+
 def generate_expectations():
     """
     Generate the expected output files for the examples.
@@ -25,20 +45,20 @@ def generate_expectations():
     expect_dir = os.path.join(examples_dir, "expects")
     print("Generating expectations in:", expect_dir)
 
-    for example_file in sorted(os.listdir(examples_dir)):
-        if example_file.endswith(".poml"):
-            context_file = example_file.replace(".poml", ".context.json")
-            if os.path.exists(os.path.join(examples_dir, context_file)):
-                context = json.load(open(os.path.join(examples_dir, context_file)))
-            else:
-                context = None
+    example_files = [f for f in sorted(os.listdir(examples_dir)) if f.endswith(".poml")]
+
+    # Each example is rendered by an independent Node invocation with no shared
+    # state, so the files can be processed in parallel across cores.
+    # Set POML_GENERATE_JOBS=1 to restore serial processing.
+    jobs = int(os.environ.get("POML_GENERATE_JOBS", os.cpu_count() or 1))
+    if jobs <= 1:
+        for example_file in example_files:
             print(f"Processing example: {example_file}")
-            # Generate the expected output
-            process_example(
-                os.path.join(examples_dir, example_file),
-                os.path.join(expect_dir, example_file.replace(".poml", ".txt")),
-                context,
-            )
+            _process_one(example_file)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for example_file in pool.map(_process_one, example_files):
+                print(f"Processed example: {example_file}")
 
 
 if __name__ == "__main__":
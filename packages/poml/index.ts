@@ -1,4 +1,5 @@
 import * as React from 'react';
+import * as readline from 'readline';
 import { readFileSync, writeFileSync } from 'fs';
 import { renderToString } from 'react-dom/server';
 import path from 'path';
@@ -126,12 +127,13 @@ export const poml = async (element: React.ReactElement | string): Promise<RichCo
   return result;
 };
 
-interface CliArgs {
+export interface CliArgs {
   input?: string;
   file?: string;
   output?: string;
   context?: string[];
   contextFile?: string;
+  contextString?: string;
   stylesheet?: string;
   stylesheetFile?: string;
   trim?: boolean;
@@ -149,13 +151,19 @@ interface CliResult {
   runtime?: { [key: string]: any };
 }
 
-export async function commandLine(args: CliArgs) {
+export async function commandLine(args: CliArgs, writeOutput?: (output: string) => void) {
   const readOptions = {
     trim: args.trim,
   };
 
   if (args.traceDir) {
     setTrace(true, args.traceDir);
+  } else {
+    // The server loop reuses this function across requests in one process, so
+    // an absent traceDir must actively switch tracing off again; otherwise a
+    // single traced call would leave every later request dumping into the
+    // stale run directory.
+    setTrace(false);
   }
 
   // Determine the working directory
@@ -193,6 +201,8 @@ export async function commandLine(args: CliArgs) {
     const contextFilePath = path.resolve(workingDirectory, args.contextFile);
     const contextFromFile = parseJsonWithBuffers(readFileSync(contextFilePath, { encoding: 'utf8' }));
     context = { ...context, ...contextFromFile };
+  } else if (args.contextString) {
+    context = { ...context, ...parseJsonWithBuffers(args.contextString) };
   }
 
   let stylesheet: { [key: string]: any } = {};
@@ -240,6 +250,8 @@ export async function commandLine(args: CliArgs) {
     if (args.output) {
       const outputPath = path.resolve(workingDirectory, args.output);
       writeFileSync(outputPath, output);
+    } else if (writeOutput) {
+      writeOutput(output);
     } else {
       process.stdout.write(output);
     }
@@ -254,6 +266,43 @@ export async function commandLine(args: CliArgs) {
   }
 }
 
+/**
+ * Serve {@link commandLine} requests over a line-delimited JSON protocol so
+ * that callers (e.g., the Python SDK) can reuse a single Node process instead
+ * of paying process startup per call.
+ *
+ * Each request is one line of JSON `{"argv": [...]}` mirroring the one-shot
+ * CLI arguments; `parseArgs` turns that argv back into {@link CliArgs}. Each
+ * response is one line of JSON: `{"ok": true}` when the output was written to
+ * a file, `{"ok": true, "result": "..."}` when no output file was requested,
+ * or `{"ok": false, "error": "..."}` on failure. `input` and `writeLine`
+ * default to stdin/stdout and are injectable for tests.
+ */
+export async function serverLoop(
+  parseArgs: (argv: string[]) => CliArgs,
+  input: NodeJS.ReadableStream = process.stdin,
+  writeLine: (line: string) => void = (line) => process.stdout.write(line),
+) {
+  const rl = readline.createInterface({ input, terminal: false });
+  for await (const line of rl) {
+    if (!line.trim()) {
+      continue;
+    }
+    let response: { ok: boolean; result?: string; error?: string };
+    try {
+      const request = JSON.parse(line);
+      let inlineResult: string | undefined;
+      await commandLine(parseArgs(request.argv ?? []), (output) => {
+        inlineResult = output;
+      });
+      response = inlineResult !== undefined ? { ok: true, result: inlineResult } : { ok: true };
+    } catch (error: any) {
+      response = { ok: false, error: String(error?.message ?? error) };
+    }
+    writeLine(JSON.stringify(response) + '\n');
+  }
+}
+
 const renderContent = (content: RichContent) => {
   if (typeof content === 'string') {
     return content;
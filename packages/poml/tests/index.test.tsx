@@ -5,7 +5,10 @@ import * as path from 'path';
 import { beforeAll, afterAll, describe, expect, test, jest } from '@jest/globals';
 import { spyOn } from 'jest-mock';
 
-import { read, write, writeWithSourceMap, poml, commandLine, _readWithFile } from 'poml';
+import { Readable } from 'stream';
+
+import { read, write, writeWithSourceMap, poml, commandLine, serverLoop, _readWithFile } from 'poml';
+import type { CliArgs } from 'poml';
 import { Markup } from 'poml/presentation';
 import { ErrorCollection, ReadError, WriteError } from 'poml/base';
 
@@ -669,6 +672,37 @@ describe('cli', () => {
     expect(process.stdout.write).toHaveBeenCalledWith('{"messages":[{"speaker":"human","content":"world"}]}');
   });
 
+  test('contextString', async () => {
+    const text = '<Markup.Paragraph>{{name}}</Markup.Paragraph>';
+    await commandLine({ input: text, contextString: '{"name":"world"}', speakerMode: false });
+    expect(process.stdout.write).toHaveBeenCalledWith('{"messages":"world"}');
+  });
+
+  test('writeOutputCallback', async () => {
+    const text = '<Markup.Paragraph>Hello, world!</Markup.Paragraph>';
+    let captured: string | undefined;
+    await commandLine({ input: text, speakerMode: false }, (output) => {
+      captured = output;
+    });
+    expect(captured).toBe('{"messages":"Hello, world!"}');
+  });
+
+  test('serverLoopFraming', async () => {
+    const requests = [
+      JSON.stringify({ argv: ['ok'] }) + '\n',
+      JSON.stringify({ argv: [] }) + '\n', // neither input nor file: must error
+    ];
+    const parse = (argv: string[]): CliArgs =>
+      argv[0] === 'ok' ? { input: '<Markup.Paragraph>served</Markup.Paragraph>', speakerMode: false } : {};
+    const lines: string[] = [];
+    await serverLoop(parse, Readable.from(requests), (line) => lines.push(line));
+    expect(lines).toHaveLength(2);
+    expect(JSON.parse(lines[0])).toStrictEqual({ ok: true, result: '{"messages":"served"}' });
+    const failure = JSON.parse(lines[1]);
+    expect(failure.ok).toBe(false);
+    expect(failure.error).toContain('Must specify either input or file');
+  });
+
   test('contentWithResponseSchema', async () => {
     const text =
       '<poml>Hello, world!<output-schema>z.object({ operation: z.enum(["add", "subtract"]), a: z.number(), b: z.number() })</output-schema></poml>';
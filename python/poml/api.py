@@ -9,9 +9,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
-from .cli import run
+from .cli import CliServerUnavailable, _worker, run
 
 __all__ = [
     "set_trace",
@@ -30,6 +30,40 @@ _mlflow_enabled: bool = False
 _trace_log: List[Dict[str, Any]] = []
 _trace_dir: Optional[Path] = None
 
+# Backend integration modules, imported once when set_trace enables them.
+_weave_mod: Optional[Any] = None
+_agentops_mod: Optional[Any] = None
+_mlflow_mod: Optional[Any] = None
+
+# Incrementally tracked position of the newest trace record, so that
+# _latest_trace_prefix() does not rescan the trace directory on every call.
+# None means the cache is cold and the next lookup falls back to a scan.
+_latest_trace_idx: Optional[int] = None
+_latest_trace_prefix_cached: Optional[Path] = None
+
+try:
+    # orjson is an optional dependency; when present it speeds up the
+    # per-call JSON encode/decode several-fold.
+    import orjson as _orjson
+
+    def _json_dumps(obj: Any) -> str:
+        # OPT_NON_STR_KEYS matches the stdlib behavior of coercing dict keys
+        # like {1: ...} to strings instead of raising TypeError.
+        return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    _json_loads = _orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Compiled once at import; evaluated on every poml() call with a string markup.
+_PATH_LIKE_RE = re.compile(r"^[\w\-./]+$")
+
+# Linux caps a single argv entry at MAX_ARG_STRLEN (128 KiB); inputs above
+# this limit go through a temporary file so the one-shot CLI path keeps
+# working when the persistent worker is unavailable.
+_INLINE_ARG_LIMIT = 100_000
+
 Backend = Literal["local", "weave", "agentops", "mlflow"]
 OutputFormat = Literal["raw", "message_dict", "dict", "openai_chat", "langchain", "pydantic"]
 
@@ -70,6 +104,7 @@ def set_trace(
         enabled = [enabled]
 
     global _trace_enabled, _trace_dir, _weave_enabled, _agentops_enabled, _mlflow_enabled
+    global _latest_trace_idx, _latest_trace_prefix_cached
     if enabled or "local" in enabled:
         # When enabled is non-empty, we always enable local tracing.
         _trace_enabled = True
@@ -77,9 +112,17 @@ def set_trace(
         if trace_dir is not None:
             base = Path(trace_dir)
             base.mkdir(parents=True, exist_ok=True)
-            ts = datetime.now().strftime("%Y%m%d%H%M%S%f")
-            run_dir = base / ts
-            run_dir.mkdir(parents=True, exist_ok=True)
+            # Create the run directory exclusively: two set_trace calls within
+            # the same microsecond (e.g., parallel CI matrices) would otherwise
+            # silently share one directory.
+            while True:
+                ts = datetime.now().strftime("%Y%m%d%H%M%S%f")
+                run_dir = base / ts
+                try:
+                    run_dir.mkdir(parents=True)
+                except FileExistsError:
+                    continue
+                break
             _trace_dir = run_dir
         elif env_dir:
             run_dir = Path(env_dir)
@@ -87,22 +130,46 @@ def set_trace(
             _trace_dir = run_dir
         else:
             _trace_dir = None
+        if _trace_dir is not None:
+            # Scan the directory exactly once; poml() keeps the cache fresh afterwards.
+            _latest_trace_idx, _latest_trace_prefix_cached = _scan_latest_trace_prefix()
+        else:
+            _latest_trace_idx = None
+            _latest_trace_prefix_cached = None
     else:
         _trace_enabled = False
         _trace_dir = None
+        _latest_trace_idx = None
+        _latest_trace_prefix_cached = None
 
+    # Import each enabled backend once here rather than on every poml() call;
+    # this also surfaces missing-dependency errors at enable time instead of
+    # on the first traced call.
+    global _weave_mod, _agentops_mod, _mlflow_mod
     if "weave" in enabled:
         _weave_enabled = True
+        if _weave_mod is None:
+            from .integration import weave
+
+            _weave_mod = weave
     else:
         _weave_enabled = False
 
     if "agentops" in enabled:
         _agentops_enabled = True
+        if _agentops_mod is None:
+            from .integration import agentops
+
+            _agentops_mod = agentops
     else:
         _agentops_enabled = False
 
     if "mlflow" in enabled:
         _mlflow_enabled = True
+        if _mlflow_mod is None:
+            from .integration import mlflow
+
+            _mlflow_mod = mlflow
     else:
         _mlflow_enabled = False
 
@@ -127,31 +194,86 @@ def _current_trace_version() -> Optional[str]:
         return _trace_dir.name
 
 
+def _scan_latest_trace_prefix() -> tuple[int, Optional[Path]]:
+    """Scan the trace directory for the newest trace record.
+
+    Only used to warm the cache (or recover from a stale one); steady-state
+    lookups go through _latest_trace_prefix() without touching the disk.
+    """
+    assert _trace_dir is not None
+
+    latest_idx = -1
+    latest_prefix_part: Optional[str] = None
+
+    # os.scandir avoids building a Path object (and the stat it implies for
+    # most uses) per directory entry; only the name is needed here.
+    with os.scandir(_trace_dir) as entries:
+        for entry in entries:
+            # Trace records are named "NNNN[.name].poml"; plain string checks are
+            # much cheaper than a regex here, and this loop runs once per entry.
+            name = entry.name
+            if not name.endswith(".poml"):
+                continue
+            prefix_part = name[:-5]
+            # skip any source link files
+            if prefix_part.endswith(".source"):
+                continue
+            if not prefix_part[:4].isdigit():
+                continue
+            try:
+                idx = int(prefix_part.split(".", 1)[0])
+            except ValueError:
+                continue
+            if idx > latest_idx:
+                latest_idx = idx
+                latest_prefix_part = prefix_part
+
+    # Only materialize a Path for the single winning entry.
+    if latest_prefix_part is None:
+        return latest_idx, None
+    return latest_idx, _trace_dir / latest_prefix_part
+
+
+def _advance_trace_cache(markup: str | Path) -> None:
+    """Account for the trace record the CLI just wrote without rescanning.
+
+    The Node side writes exactly one record per invocation, at the next free
+    index, named after the source file (if any). Verify the predicted file
+    exists and fall back to a full scan when it does not (e.g., another
+    process shares the trace directory).
+    """
+    global _latest_trace_idx, _latest_trace_prefix_cached
+    if not (_trace_enabled and _trace_dir):
+        return
+    if _latest_trace_idx is None:
+        _latest_trace_idx, _latest_trace_prefix_cached = _scan_latest_trace_prefix()
+        return
+    idx = max(_latest_trace_idx, 0) + 1
+    if isinstance(markup, Path):
+        # Mirror Node's path.basename(sourcePath, ".poml") naming.
+        name = markup.name
+        stem = name[:-5] if name.endswith(".poml") else name
+        candidate = _trace_dir / f"{idx:04d}.{stem}"
+    else:
+        candidate = _trace_dir / f"{idx:04d}"
+    if Path(str(candidate) + ".poml").exists():
+        _latest_trace_idx = idx
+        _latest_trace_prefix_cached = candidate
+    else:
+        _latest_trace_idx, _latest_trace_prefix_cached = _scan_latest_trace_prefix()
+
+
 def _latest_trace_prefix() -> Optional[Path]:
+    global _latest_trace_idx, _latest_trace_prefix_cached
     if not (_trace_enabled and _trace_dir):
         return None
 
-    pattern = re.compile(r"^(\d{4}.*?)(?:\.source)?\.poml$")
-    latest_idx = -1
-    latest_prefix: Optional[Path] = None
-
-    for f in _trace_dir.iterdir():
-        match = pattern.match(f.name)
-        if not match:
-            continue
-        prefix_part = match.group(1)
-        # skip any source link files
-        if prefix_part.endswith(".source"):
-            continue
-        try:
-            idx = int(prefix_part.split(".")[0])
-        except ValueError:
-            continue
-        if idx > latest_idx:
-            latest_idx = idx
-            latest_prefix = _trace_dir / prefix_part
+    if _latest_trace_prefix_cached is not None:
+        return _latest_trace_prefix_cached
 
-    return latest_prefix
+    # Cold cache (e.g., trace dir inherited via POML_TRACE): scan once.
+    _latest_trace_idx, _latest_trace_prefix_cached = _scan_latest_trace_prefix()
+    return _latest_trace_prefix_cached
 
 
 def _read_latest_traced_file(file_suffix: str, encoding: str | None = None) -> Optional[str]:
@@ -225,18 +347,24 @@ class PomlFrame(BaseModel):
     runtime: Optional[Dict[str, Any]] = None
 
 
+# Validates a whole message list in one pass; built once at import.
+_POML_MESSAGES_ADAPTER = TypeAdapter(List[PomlMessage])
+
+
+_SPEAKER_TO_ROLE = {
+    "human": "user",
+    "ai": "assistant",
+    "system": "system",
+    "tool": "tool",
+}
+
+
 def _poml_response_to_openai_chat(messages: List[PomlMessage]) -> List[Dict[str, Any]]:
     """Convert PomlMessage objects to OpenAI chat format."""
     openai_messages = []
-    speaker_to_role = {
-        "human": "user",
-        "ai": "assistant",
-        "system": "system",
-        "tool": "tool",
-    }
 
     for msg in messages:
-        role = speaker_to_role.get(msg.speaker)
+        role = _SPEAKER_TO_ROLE.get(msg.speaker)
         if not role:
             raise ValueError(f"Unknown speaker: {msg.speaker}")
 
@@ -261,14 +389,16 @@ def _poml_response_to_openai_chat(messages: List[PomlMessage]) -> List[Dict[str,
             continue
 
         # Handle assistant/user/system messages
-        if isinstance(msg.content, str):
+        if type(msg.content) is str:
             openai_messages.append({"role": role, "content": msg.content})
         elif isinstance(msg.content, list):
             text_image_contents = []
             tool_calls = []
 
             for content_part in msg.content:
-                if isinstance(content_part, str):
+                # Exact type checks: content parts are always plain str or one
+                # of the Content* models, and `type(...) is` skips the mro walk.
+                if type(content_part) is str:
                     text_image_contents.append({"type": "text", "text": content_part})
                 elif isinstance(content_part, ContentMultiMedia):
                     text_image_contents.append(
@@ -288,6 +418,10 @@ def _poml_response_to_openai_chat(messages: List[PomlMessage]) -> List[Dict[str,
                             "type": "function",
                             "function": {
                                 "name": content_part.name,
+                                # Stdlib json on purpose: the arguments string
+                                # is user-visible output and its formatting
+                                # (space after colon) must not depend on
+                                # whether orjson is installed.
                                 "arguments": (
                                     json.dumps(content_part.content)
                                     if not isinstance(content_part.content, str)
@@ -335,7 +469,7 @@ def _rich_content_to_text(content: Union[str, List[Union[str, ContentMultiMedia]
 
     text_parts = []
     for part in content:
-        if isinstance(part, str):
+        if type(part) is str:
             text_parts.append(part)
         elif isinstance(part, ContentMultiMedia):
             # For images and other media, use alt text or type description
@@ -353,14 +487,14 @@ def _poml_response_to_langchain(messages: List[PomlMessage]) -> List[Dict[str, A
     """Convert PomlMessage objects to Langchain format."""
     langchain_messages = []
     for msg in messages:
-        if isinstance(msg.content, str):
+        if type(msg.content) is str:
             langchain_messages.append({"type": msg.speaker, "data": {"content": msg.content}})
         elif isinstance(msg.content, list):
             content_parts = []
             tool_calls = []
 
             for content_part in msg.content:
-                if isinstance(content_part, str):
+                if type(content_part) is str:
                     content_parts.append({"type": "text", "text": content_part})
                 elif isinstance(content_part, ContentMultiMedia):
                     content_parts.append(
@@ -412,6 +546,27 @@ def _poml_response_to_langchain(messages: List[PomlMessage]) -> List[Dict[str, A
     return langchain_messages
 
 
+def _classify_input(arg: dict | str | Path | None) -> tuple[str, Any]:
+    """Classify a markup/context/stylesheet argument with at most one stat call.
+
+    Returns one of:
+    - ("none", None): argument was not provided
+    - ("dict", arg): in-memory dictionary
+    - ("path", Path): an existing regular file
+    - ("missing", Path): a Path that does not point to a regular file
+    - ("string", str): a string that does not name an existing file
+    """
+    if isinstance(arg, dict):
+        return "dict", arg
+    if not arg:
+        return "none", None
+    if isinstance(arg, Path):
+        return ("path", arg) if arg.is_file() else ("missing", arg)
+    if os.path.isfile(arg):
+        return "path", Path(arg)
+    return "string", arg
+
+
 def _camel_case_to_snake_case(name: str) -> str:
     """Convert CamelCase to snake_case."""
     # Insert one underscore before each uppercase letter, then convert to lowercase
@@ -513,237 +668,289 @@ def poml(
         - The function supports various backend integrations (Weave, AgentOps, MLflow)
         - Multi-modal content (images, etc.) is supported in chat format
     """
-    temp_input_file = temp_context_file = temp_stylesheet_file = None
+    temp_input_file = temp_context_file = temp_stylesheet_file = temp_output_file = None
     trace_record: Dict[str, Any] | None = None
+
+    # Classify each argument exactly once (one stat each); the trace-record
+    # block and the CLI-args block below both reuse the result.
+    markup_kind, markup_val = _classify_input(markup)
+    context_kind, context_val = _classify_input(context)
+    stylesheet_kind, stylesheet_val = _classify_input(stylesheet)
     try:
         if _trace_enabled:
+            # With local-only tracing, Node emits the file contents into the
+            # trace directory anyway; slurping them here would double the
+            # memory use for large prompts. Only remote backends need the
+            # contents in the record right away.
+            slurp_files = _weave_enabled or _agentops_enabled or _mlflow_enabled
             trace_record = {}
-            if isinstance(markup, Path) or os.path.exists(str(markup)):
-                path = Path(markup)
-                trace_record["markup_path"] = str(path)
-                if path.exists():
-                    trace_record["markup"] = path.read_text(encoding=encoding)
+            if markup_kind == "path":
+                trace_record["markup_path"] = str(markup_val)
+                if slurp_files:
+                    trace_record["markup"] = markup_val.read_text(encoding=encoding)
+            elif markup_kind == "missing":
+                trace_record["markup_path"] = str(markup_val)
             else:
                 trace_record["markup"] = str(markup)
 
-            if isinstance(context, dict):
-                trace_record["context"] = json.dumps(context)
-            elif context:
-                if os.path.exists(str(context)):
-                    cpath = Path(context)
-                    trace_record["context_path"] = str(cpath)
-                    trace_record["context"] = cpath.read_text(encoding=encoding)
-            if isinstance(stylesheet, dict):
-                trace_record["stylesheet"] = json.dumps(stylesheet)
-            elif stylesheet:
-                if os.path.exists(str(stylesheet)):
-                    spath = Path(stylesheet)
-                    trace_record["stylesheet_path"] = str(spath)
-                    trace_record["stylesheet"] = spath.read_text(encoding=encoding)
-
-        if isinstance(markup, Path):
-            if not markup.exists():
-                raise FileNotFoundError(f"File not found: {markup}")
+            if context_kind == "dict":
+                trace_record["context"] = _json_dumps(context_val)
+            elif context_kind == "path":
+                trace_record["context_path"] = str(context_val)
+                if slurp_files:
+                    trace_record["context"] = context_val.read_text(encoding=encoding)
+            if stylesheet_kind == "dict":
+                trace_record["stylesheet"] = _json_dumps(stylesheet_val)
+            elif stylesheet_kind == "path":
+                trace_record["stylesheet_path"] = str(stylesheet_val)
+                if slurp_files:
+                    trace_record["stylesheet"] = stylesheet_val.read_text(encoding=encoding)
+
+        if markup_kind == "missing":
+            raise FileNotFoundError(f"File not found: {markup}")
+        elif markup_kind == "path":
+            markup = markup_val
+            markup_args = ["-f", str(markup)]
         else:
-            if os.path.exists(markup):
-                markup = Path(markup)
-            else:
-                # Test if the markup looks like a path.
-                if re.match(r"^[\w\-./]+$", markup):
-                    warnings.warn(
-                        f"The markup '{markup}' looks like a file path, but it does not exist. Assuming it is a POML string."
-                    )
+            # Test if the markup looks like a path.
+            if _PATH_LIKE_RE.fullmatch(markup):
+                warnings.warn(
+                    f"The markup '{markup}' looks like a file path, but it does not exist. Assuming it is a POML string."
+                )
 
+            if len(markup) <= _INLINE_ARG_LIMIT and not (_trace_enabled and _trace_dir is not None):
+                # In-memory markup goes straight to the CLI; no temp file round-trip.
+                markup_args = ["-i", markup]
+            else:
+                # Tracing keeps the temp-file path: dumpTrace only writes the
+                # NNNN.<name>.poml / .source.poml pair when it has a source
+                # file, and that two-file contract is what get_trace callers
+                # and the trace tests rely on.
                 temp_input_file = write_file(markup, encoding=encoding)
-                markup = Path(temp_input_file.name)
-        with tempfile.NamedTemporaryFile("r", encoding=encoding) as temp_output_file:
-            if output_file is None:
-                output_file = temp_output_file.name
-                output_file_specified = False
+                markup_args = ["-f", temp_input_file.name]
+        if output_file is None:
+            # Without an output file the CLI streams the result to stdout
+            # (or returns it inline over the worker protocol); no disk round-trip.
+            output_file_specified = False
+            args = list(markup_args)
+        else:
+            output_file_specified = True
+            if isinstance(output_file, Path):
+                output_file = str(output_file)
+            args = markup_args + ["-o", output_file]
+        if context_kind == "dict":
+            context_json = _json_dumps(context_val)
+            if len(context_json) <= _INLINE_ARG_LIMIT:
+                args.extend(["--contextString", context_json])
             else:
-                output_file_specified = True
-                if isinstance(output_file, Path):
-                    output_file = str(output_file)
-            args = ["-f", str(markup), "-o", output_file]
-            if isinstance(context, dict):
-                temp_context_file = write_file(json.dumps(context), encoding=encoding)
+                temp_context_file = write_file(context_json, encoding=encoding)
                 args.extend(["--context-file", temp_context_file.name])
-            elif context:
-                if os.path.exists(context):
-                    args.extend(["--context-file", str(context)])
-                else:
-                    raise FileNotFoundError(f"File not found: {context}")
-
-            if isinstance(stylesheet, dict):
-                temp_stylesheet_file = write_file(json.dumps(stylesheet), encoding=encoding)
+        elif context_kind == "path":
+            args.extend(["--context-file", str(context_val)])
+        elif context_kind != "none":
+            raise FileNotFoundError(f"File not found: {context}")
+
+        if stylesheet_kind == "dict":
+            stylesheet_json = _json_dumps(stylesheet_val)
+            if len(stylesheet_json) <= _INLINE_ARG_LIMIT:
+                args.extend(["--stylesheet", stylesheet_json])
+            else:
+                temp_stylesheet_file = write_file(stylesheet_json, encoding=encoding)
                 args.extend(["--stylesheet-file", temp_stylesheet_file.name])
-            elif stylesheet:
-                if os.path.exists(stylesheet):
-                    args.extend(["--stylesheet-file", str(stylesheet)])
-                else:
-                    raise FileNotFoundError(f"File not found: {stylesheet}")
+        elif stylesheet_kind == "path":
+            args.extend(["--stylesheet-file", str(stylesheet_val)])
+        elif stylesheet_kind != "none":
+            raise FileNotFoundError(f"File not found: {stylesheet}")
 
-            if chat:
-                args.extend(["--chat", "true"])
-            else:
-                args.extend(["--chat", "false"])
+        if chat:
+            args.extend(["--chat", "true"])
+        else:
+            args.extend(["--chat", "false"])
 
-            if _trace_enabled and _trace_dir is not None:
-                args.extend(["--traceDir", str(_trace_dir)])
+        if _trace_enabled and _trace_dir is not None:
+            args.extend(["--traceDir", str(_trace_dir)])
 
-            if extra_args:
-                args.extend(extra_args)
-            process = run(*args)
+        # The worker process outlives any os.chdir() in the caller, so pin the
+        # resolution of relative -f/-o/--context-file paths to the cwd at call
+        # time rather than the worker's spawn-time directory.
+        args.extend(["--cwd", os.getcwd()])
+
+        if extra_args:
+            args.extend(extra_args)
+        try:
+            inline_result = _worker.request(*args)
+        except CliServerUnavailable:
+            # Bundled CLI without server support: pay the one-shot cost. The
+            # result goes through a temporary -o file rather than captured
+            # stdout, which library logging (e.g. pdf.js warnings) can
+            # interleave with and corrupt.
+            fallback_args = list(args)
+            if not output_file_specified:
+                temp_output_file = write_file("", encoding=encoding)
+                fallback_args.extend(["-o", temp_output_file.name])
+            process = run(*fallback_args)
             if process.returncode != 0:
                 raise RuntimeError(
                     f"POML command failed with return code {process.returncode}. See the log for details."
                 )
+            inline_result = None
+            if temp_output_file is not None:
+                with open(temp_output_file.name, "r", encoding=encoding) as output_file_handle:
+                    inline_result = output_file_handle.read()
+
+        if _trace_enabled and _trace_dir is not None:
+            # String markups were spooled to a temp file above, and Node names
+            # the dumped record after that file, so predict from its path.
+            _advance_trace_cache(Path(temp_input_file.name) if temp_input_file is not None else markup)
+
+        if output_file_specified:
+            with open(output_file, "r", encoding=encoding) as output_file_handle:
+                result = output_file_handle.read()
+        else:
+            if inline_result is None:
+                raise RuntimeError("POML command produced no output.")
+            result = inline_result
 
-            if output_file_specified:
-                with open(output_file, "r", encoding=encoding) as output_file_handle:
-                    result = output_file_handle.read()
-            else:
-                result = temp_output_file.read()
+        if format == "raw":
+            # Do nothing
+            return_result = trace_result = result
+        else:
+            parsed_result = trace_result = _json_loads(result)
 
-            if format == "raw":
-                # Do nothing
-                return_result = trace_result = result
+            # Handle the new CLI result format with messages, schema, tools, runtime
+            if isinstance(parsed_result, dict) and "messages" in parsed_result:
+                cli_result = parsed_result
+                messages_data = cli_result["messages"]
             else:
-                parsed_result = trace_result = json.loads(result)
-
-                # Handle the new CLI result format with messages, schema, tools, runtime
-                if isinstance(parsed_result, dict) and "messages" in parsed_result:
-                    cli_result = parsed_result
-                    messages_data = cli_result["messages"]
-                else:
-                    # Legacy format - just messages
-                    cli_result: dict = {"messages": parsed_result}
-                    messages_data = parsed_result
-
-                if format == "message_dict":
-                    # Legacy behavior - return just the messages
-                    return_result = messages_data
-                elif format == "dict":
-                    # Return the full CLI result structure
-                    return_result = cli_result
+                # Legacy format - just messages
+                cli_result: dict = {"messages": parsed_result}
+                messages_data = parsed_result
+
+            if format == "message_dict":
+                # Legacy behavior - return just the messages
+                return_result = messages_data
+            elif format == "dict":
+                # Return the full CLI result structure
+                return_result = cli_result
+            else:
+                # Convert to pydantic messages for other formats
+                if chat:
+                    # Batch validation through a shared TypeAdapter is
+                    # noticeably faster than a PomlMessage(**item) per item.
+                    pydantic_messages = _POML_MESSAGES_ADAPTER.validate_python(messages_data)
+                elif format != "pydantic" and type(messages_data) is str:
+                    # Plain-text non-chat result: the converters below would
+                    # wrap the string into a PomlMessage only to unwrap it
+                    # again, so skip the pydantic round-trip entirely.
+                    pydantic_messages = None
                 else:
-                    # Convert to pydantic messages for other formats
-                    if chat:
-                        pydantic_messages = [PomlMessage(**item) for item in messages_data]
-                    else:
-                        # TODO: Make it a RichContent object
-                        pydantic_messages = [PomlMessage(speaker="human", content=messages_data)]  # type: ignore
+                    # TODO: Make it a RichContent object
+                    pydantic_messages = [PomlMessage(speaker="human", content=messages_data)]  # type: ignore
 
+                output_schema = cli_result.get("schema")
+                tools = cli_result.get("tools")
+                runtime = cli_result.get("runtime")
+
+                if format == "pydantic":
                     # Create PomlFrame with full data
-                    poml_frame = PomlFrame(
+                    return_result = PomlFrame(
                         messages=pydantic_messages,
-                        output_schema=cli_result.get("schema"),
-                        tools=cli_result.get("tools"),
-                        runtime=cli_result.get("runtime"),
+                        output_schema=output_schema,
+                        tools=tools,
+                        runtime=runtime,
                     )
-
-                    if format == "pydantic":
-                        return_result = poml_frame
-                    elif format == "openai_chat":
-                        # Return OpenAI-compatible format
+                elif format == "openai_chat":
+                    # Return OpenAI-compatible format
+                    if pydantic_messages is None:
+                        openai_messages = [{"role": "user", "content": messages_data}]
+                    else:
                         openai_messages = _poml_response_to_openai_chat(pydantic_messages)
-                        openai_result: dict = {"messages": openai_messages}
-
-                        # Add tools if present
-                        if poml_frame.tools:
-                            openai_result["tools"] = [
-                                {
-                                    "type": "function",
-                                    "function": {
-                                        "name": tool.get("name", ""),
-                                        "description": tool.get("description", ""),
-                                        "parameters": tool.get("parameters", {}),
-                                    },  # FIXME: hot-fix for the wrong format at node side
-                                }
-                                for tool in poml_frame.tools
-                            ]
-                        if poml_frame.output_schema:
-                            openai_result["response_format"] = {
-                                "type": "json_schema",
-                                "json_schema": {
-                                    "name": "schema",  # TODO: support schema name
-                                    "schema": poml_frame.output_schema,
-                                    "strict": True,  # Ensure strict validation
-                                },
+                    openai_result: dict = {"messages": openai_messages}
+
+                    # Add tools if present
+                    if tools:
+                        openai_result["tools"] = [
+                            {
+                                "type": "function",
+                                "function": {
+                                    "name": tool.get("name", ""),
+                                    "description": tool.get("description", ""),
+                                    "parameters": tool.get("parameters", {}),
+                                },  # FIXME: hot-fix for the wrong format at node side
                             }
-                        if poml_frame.runtime:
-                            openai_result.update(
-                                {_camel_case_to_snake_case(k): v for k, v in poml_frame.runtime.items()}
-                            )
-
-                        return_result = openai_result
-                    elif format == "langchain":
-                        messages_data = _poml_response_to_langchain(pydantic_messages)
-                        return_result = {
-                            "messages": messages_data,
-                            **{k: v for k, v in cli_result.items() if k != "messages"},
+                            for tool in tools
+                        ]
+                    if output_schema:
+                        openai_result["response_format"] = {
+                            "type": "json_schema",
+                            "json_schema": {
+                                "name": "schema",  # TODO: support schema name
+                                "schema": output_schema,
+                                "strict": True,  # Ensure strict validation
+                            },
                         }
+                    if runtime:
+                        openai_result.update({_camel_case_to_snake_case(k): v for k, v in runtime.items()})
+
+                    return_result = openai_result
+                elif format == "langchain":
+                    if pydantic_messages is None:
+                        messages_data = [{"type": "human", "data": {"content": messages_data}}]
                     else:
-                        raise ValueError(f"Unknown output format: {format}")
+                        messages_data = _poml_response_to_langchain(pydantic_messages)
+                    return_result = {
+                        "messages": messages_data,
+                        **{k: v for k, v in cli_result.items() if k != "messages"},
+                    }
+                else:
+                    raise ValueError(f"Unknown output format: {format}")
+
+        def _backend_call_inputs() -> tuple[str, Any, Any]:
+            """Inputs for log_poml_call, preferring in-memory data over trace-file reads.
+
+            Everything needed was already read (or passed in) while building
+            the call; only fall back to the trace files Node emitted when a
+            field never made it into memory.
+            """
+            record = trace_record or {}
+            poml_content = record.get("markup") or _read_latest_traced_file(".poml", encoding=encoding) or str(markup)
+            if context_kind == "dict":
+                log_context = context_val
+            elif "context" in record:
+                log_context = _json_loads(record["context"])
+            else:
+                content = _read_latest_traced_file(".context.json", encoding=encoding)
+                log_context = _json_loads(content) if content else None
+            if stylesheet_kind == "dict":
+                log_stylesheet = stylesheet_val
+            elif "stylesheet" in record:
+                log_stylesheet = _json_loads(record["stylesheet"])
+            else:
+                content = _read_latest_traced_file(".stylesheet.json", encoding=encoding)
+                log_stylesheet = _json_loads(content) if content else None
+            return poml_content, log_context, log_stylesheet
+
+        if _weave_enabled or _agentops_enabled or _mlflow_enabled:
+            # Resolve the shared logging inputs once and hand the same values
+            # to every enabled backend instead of recomputing them per backend.
+            trace_prefix = _latest_trace_prefix()
+            current_version = _current_trace_version()
+            if trace_prefix is None or current_version is None:
+                raise RuntimeError("Backend tracing (weave/agentops/mlflow) requires local tracing to be enabled.")
+            poml_content, log_context, log_stylesheet = _backend_call_inputs()
 
             if _weave_enabled:
-                from .integration import weave
-
-                trace_prefix = _latest_trace_prefix()
-                current_version = _current_trace_version()
-                if trace_prefix is None or current_version is None:
-                    raise RuntimeError("Weave tracing requires local tracing to be enabled.")
-                poml_content = _read_latest_traced_file(".poml", encoding=encoding)
-                context_content = _read_latest_traced_file(".context.json", encoding=encoding)
-                stylesheet_content = _read_latest_traced_file(".stylesheet.json", encoding=encoding)
-
-                weave.log_poml_call(
-                    trace_prefix.name,
-                    poml_content or str(markup),
-                    json.loads(context_content) if context_content else None,
-                    json.loads(stylesheet_content) if stylesheet_content else None,
-                    trace_result,
-                )
+                _weave_mod.log_poml_call(trace_prefix.name, poml_content, log_context, log_stylesheet, trace_result)
 
             if _agentops_enabled:
-                from .integration import agentops
-
-                trace_prefix = _latest_trace_prefix()
-                current_version = _current_trace_version()
-                if trace_prefix is None or current_version is None:
-                    raise RuntimeError("AgentOps tracing requires local tracing to be enabled.")
-                poml_content = _read_latest_traced_file(".poml", encoding=encoding)
-                context_content = _read_latest_traced_file(".context.json", encoding=encoding)
-                stylesheet_content = _read_latest_traced_file(".stylesheet.json", encoding=encoding)
-                agentops.log_poml_call(
-                    trace_prefix.name,
-                    str(markup),
-                    json.loads(context_content) if context_content else None,
-                    json.loads(stylesheet_content) if stylesheet_content else None,
-                    trace_result,
-                )
+                _agentops_mod.log_poml_call(trace_prefix.name, poml_content, log_context, log_stylesheet, trace_result)
 
             if _mlflow_enabled:
-                from .integration import mlflow
-
-                trace_prefix = _latest_trace_prefix()
-                current_version = _current_trace_version()
-                if trace_prefix is None or current_version is None:
-                    raise RuntimeError("MLflow tracing requires local tracing to be enabled.")
-                poml_content = _read_latest_traced_file(".poml", encoding=encoding)
-                context_content = _read_latest_traced_file(".context.json", encoding=encoding)
-                stylesheet_content = _read_latest_traced_file(".stylesheet.json", encoding=encoding)
-                mlflow.log_poml_call(
-                    trace_prefix.name,
-                    poml_content or str(markup),
-                    json.loads(context_content) if context_content else None,
-                    json.loads(stylesheet_content) if stylesheet_content else None,
-                    trace_result,
-                )
+                _mlflow_mod.log_poml_call(trace_prefix.name, poml_content, log_context, log_stylesheet, trace_result)
 
-            if trace_record is not None:
-                trace_record["result"] = trace_result
-            return return_result
+        if trace_record is not None:
+            trace_record["result"] = trace_result
+        return return_result
     finally:
         if temp_input_file:
             temp_input_file.close()
@@ -751,6 +958,8 @@ def poml(
             temp_context_file.close()
         if temp_stylesheet_file:
             temp_stylesheet_file.close()
+        if temp_output_file:
+            temp_output_file.close()
         if trace_record is not None:
             _trace_log.append(trace_record)
 
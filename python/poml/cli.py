@@ -1,11 +1,29 @@
 from __future__ import annotations
 
+import atexit
+import json
 import os
 import subprocess
 import sys
-from typing import Any, NoReturn
+import threading
+from typing import Any, NoReturn, Optional
 
 import nodejs_wheel
+from nodejs_wheel import executable as _node_dist
+
+
+def _cli_script() -> str:
+    script = os.path.join(os.path.dirname(__file__), "js", "cli.js")
+    if not os.path.exists(script):
+        raise RuntimeError(f"Expected CLI entrypoint: {script} to exist")
+    return script
+
+
+def _node_executable() -> str:
+    """Locate the node binary bundled with nodejs_wheel for direct Popen use."""
+    if os.name == "nt":
+        return os.path.join(_node_dist.ROOT_DIR, "node.exe")
+    return os.path.join(_node_dist.ROOT_DIR, "bin", "node")
 
 
 def node(*args: str, **kwargs: Any) -> subprocess.CompletedProcess[bytes | str]:
@@ -13,11 +31,113 @@ def node(*args: str, **kwargs: Any) -> subprocess.CompletedProcess[bytes | str]:
 
 
 def run(*args: str, **kwargs: Any) -> subprocess.CompletedProcess[bytes | str]:
-    script = os.path.join(os.path.dirname(__file__), "js", "cli.js")
-    if not os.path.exists(script):
-        raise RuntimeError(f"Expected CLI entrypoint: {script} to exist")
+    return node(_cli_script(), *args, **kwargs)
+
+
+class CliServerUnavailable(RuntimeError):
+    """Raised when the bundled CLI does not support ``--server`` mode."""
+
+
+class _PomlWorker:
+    """A long-lived ``node cli.js --server`` process shared across ``poml()`` calls.
+
+    Spawning Node per call pays process startup and JS warmup cost on every
+    invocation, which dominates for small markups and per-file loops. The
+    worker instead speaks a line-delimited JSON protocol: one
+    ``{"argv": [...]}`` request per line on stdin, one
+    ``{"ok": ..., "result": ..., "error": ...}`` response per line on stdout.
+    """
+
+    def __init__(self) -> None:
+        self._process: Optional[subprocess.Popen[str]] = None
+        self._lock = threading.RLock()
+        # Responses served by the current process; used to tell a CLI that
+        # never spoke the protocol apart from a worker that died mid-stream.
+        self._served = 0
+        # Set once the bundled cli.js proves it predates --server mode, so
+        # later calls skip the doomed spawn and go straight to one-shot runs.
+        self._unavailable = False
+
+    def _spawn(self) -> subprocess.Popen[str]:
+        return subprocess.Popen(
+            [_node_executable(), _cli_script(), "--server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            encoding="utf-8",
+        )
+
+    def request(self, *args: str) -> Optional[str]:
+        """Run one CLI invocation on the worker.
+
+        Returns the inline result when no output file was requested, None otherwise.
+        Raises CliServerUnavailable when the bundled CLI predates server mode,
+        so callers can fall back to a one-shot ``run()``.
+        """
+        with self._lock:
+            if self._unavailable:
+                raise CliServerUnavailable("POML CLI does not support --server mode")
+            if self._process is None or self._process.poll() is not None:
+                self._process = self._spawn()
+                self._served = 0
+            process = self._process
+            assert process.stdin is not None and process.stdout is not None
+            try:
+                process.stdin.write(json.dumps({"argv": list(args)}) + "\n")
+                process.stdin.flush()
+            except (BrokenPipeError, OSError):
+                self._worker_died()
+            while True:
+                try:
+                    line = process.stdout.readline()
+                except (BrokenPipeError, OSError):
+                    line = ""
+                if not line:
+                    # The process exited without answering.
+                    self._worker_died()
+                try:
+                    response = json.loads(line)
+                except ValueError:
+                    # Stray library logging on stdout (cli.js builds predating
+                    # the stderr redirect); skip until a protocol frame arrives.
+                    continue
+                if isinstance(response, dict) and "ok" in response:
+                    break
+            self._served += 1
+            if not response.get("ok"):
+                raise RuntimeError(f"POML command failed: {response.get('error', 'unknown error')}")
+            return response.get("result")
+
+    def _worker_died(self) -> NoReturn:
+        """Classify a dead worker and raise the matching CliServerUnavailable.
+
+        A process that never answered a single frame means the bundled cli.js
+        predates --server mode; that verdict is cached so later calls skip the
+        doomed spawn. A worker that had already served responses merely
+        crashed, so the next call may spawn a fresh one.
+        """
+        served = self._served
+        self.terminate()
+        if served == 0:
+            self._unavailable = True
+            raise CliServerUnavailable("POML CLI does not support --server mode")
+        raise CliServerUnavailable("POML worker exited unexpectedly; retrying as a one-shot call")
+
+    def terminate(self) -> None:
+        with self._lock:
+            process = self._process
+            self._process = None
+        if process is not None and process.poll() is None:
+            if process.stdin is not None:
+                process.stdin.close()
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
 
-    return node(script, *args, **kwargs)
+_worker = _PomlWorker()
+atexit.register(_worker.terminate)
 
 
 def entrypoint() -> NoReturn:
@@ -1,17 +1,31 @@
 from pathlib import Path
 from typing import Any, Union
 
-from langchain_core.messages import messages_from_dict
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, messages_from_dict
 from langchain_core.prompt_values import ChatPromptValue, StringPromptValue
 from langchain_core.prompts import PromptTemplate
 from typing_extensions import override
 
 from poml.api import poml
 
+_TEXT_MESSAGE_TYPES = {"human": HumanMessage, "ai": AIMessage, "system": SystemMessage}
+
 
 def poml_formatter(markup: Union[str, Path], speaker_mode: bool, context: dict | None = None):
     response = poml(markup, chat=speaker_mode, context=context, format="langchain")
-    return messages_from_dict(response["messages"])
+    messages = response["messages"]
+    # Fast path for the common text-only conversation: build the message
+    # objects directly instead of going through the generic messages_from_dict
+    # machinery, which only pays off when tool calls or multimodal parts need
+    # to be revived.
+    fast_messages = []
+    for message in messages:
+        constructor = _TEXT_MESSAGE_TYPES.get(message["type"])
+        data = message["data"]
+        if constructor is None or set(data) != {"content"} or type(data["content"]) is not str:
+            return messages_from_dict(messages)
+        fast_messages.append(constructor(content=data["content"]))
+    return fast_messages
 
 
 class LangchainPomlTemplate(PromptTemplate):
@@ -86,36 +100,29 @@ class LangchainPomlTemplate(PromptTemplate):
 
     def format(self, **kwargs) -> Union[ChatPromptValue, StringPromptValue]:  # type: ignore
         kwargs = self._merge_partial_and_user_variables(**kwargs)
-        if self.template_file:
-            formatted_messages = poml_formatter(self.template_file, self.speaker_mode, kwargs)
-        else:
-            formatted_messages = poml_formatter(self.template, self.speaker_mode, kwargs)
+        template = self.template_file if self.template_file else self.template
         if self.speaker_mode:
-            return ChatPromptValue(messages=formatted_messages)
+            return ChatPromptValue(messages=poml_formatter(template, self.speaker_mode, kwargs))
         else:
-            if len(formatted_messages) == 1:
-                if isinstance(formatted_messages[0].content, str):
-                    return StringPromptValue(text=formatted_messages[0].content)
-                elif isinstance(formatted_messages[0].content, list):
-                    # If the content is a list, we assume it's a single message with multiple parts.
-                    if len(formatted_messages[0].content) == 1:
-                        # If there's only one part, return it as a StringPromptValue
-                        if isinstance(formatted_messages[0].content[0], str):
-                            return StringPromptValue(text=formatted_messages[0].content[0])
-                        else:
-                            raise ValueError(
-                                f"Unsupported content type for non-speaker mode: {formatted_messages[0].content[0]}"
-                            )
+            # Non-speaker mode only ever surfaces a single text segment, so read
+            # the raw content from the dict format and unwrap it directly
+            # instead of constructing langchain messages that are immediately
+            # taken apart again.
+            content = poml(template, chat=False, context=kwargs, format="dict")["messages"]  # type: ignore
+            if isinstance(content, str):
+                return StringPromptValue(text=content)
+            elif isinstance(content, list):
+                # If the content is a list, we assume it's a single message with multiple parts.
+                if len(content) == 1:
+                    # If there's only one part, return it as a StringPromptValue
+                    if isinstance(content[0], str):
+                        return StringPromptValue(text=content[0])
                     else:
-                        raise ValueError(
-                            f"Multi-part contents is not supported for non-speaker mode: {formatted_messages[0].content}"
-                        )
+                        raise ValueError(f"Unsupported content type for non-speaker mode: {content[0]}")
                 else:
-                    raise ValueError(f"Unsupported content type for non-speaker mode: {formatted_messages[0].content}")
+                    raise ValueError(f"Multi-part contents is not supported for non-speaker mode: {content}")
             else:
-                raise ValueError(
-                    f"Multiple messages returned, but non-speaker mode requires a single message: {formatted_messages}"
-                )
+                raise ValueError(f"Unsupported content type for non-speaker mode: {content}")
 
     def format_prompt(self, **kwargs):
         return self.format(**kwargs)
@@ -3,16 +3,13 @@ import time
 
 import agentops
 from agentops_utils import check_trace, get_trace_id
-from openai import OpenAI
+from openai_utils import get_openai_client
 
 if __name__ == "__main__":
     api_key = os.environ["AGENTOPS_API_KEY"]
     agentops.init(auto_start_session=False, api_key=api_key)
     trace = agentops.start_trace("poml_baseline")
-    client = OpenAI(
-        base_url=os.environ["OPENAI_API_BASE"],
-        api_key=os.environ["OPENAI_API_KEY"],
-    )
+    client = get_openai_client()
 
     response = client.chat.completions.create(
         model="gpt-4.1-nano",
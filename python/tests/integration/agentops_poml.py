@@ -2,7 +2,7 @@ import os
 
 import agentops
 from agentops_utils import check_trace, get_trace_id
-from openai import OpenAI
+from openai_utils import get_openai_client
 
 import poml
 
@@ -10,10 +10,7 @@ if __name__ == "__main__":
     api_key = os.environ["AGENTOPS_API_KEY"]
     agentops.init(auto_start_session=False, api_key=api_key)
     trace = agentops.start_trace("poml_integration")
-    client = OpenAI(
-        base_url=os.environ["OPENAI_API_BASE"],
-        api_key=os.environ["OPENAI_API_KEY"],
-    )
+    client = get_openai_client()
 
     poml.set_trace("agentops", trace_dir="pomlruns")
     messages = poml.poml("../assets/explain_code.poml", context={"code_path": "sample.py"}, format="openai_chat")
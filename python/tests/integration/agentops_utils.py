@@ -4,71 +4,142 @@ https://docs.agentops.ai/v2/usage/public-api#get-trace-metrics
 """
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-from common_utils import Colors, print_section, print_separator
+from common_utils import Colors, json_loads, poll_until, print_section, print_separator
 from opentelemetry.trace.span import format_trace_id
-
-
-def get_bearer_token(api_key):
-    """Exchange API key for a bearer token"""
-    url = "https://api.agentops.ai/public/v1/auth/access_token"
-    headers = {"Content-Type": "application/json"}
-    data = {"api_key": api_key}
-
-    response = requests.post(url, headers=headers, json=data)
-    if response.status_code == 200:
-        return response.json()["bearer"]
-    else:
-        raise Exception(f"Failed to get bearer token: {response.status_code} - {response.text}")
-
-
-def get_trace_details(bearer_token, trace_id):
-    """Get comprehensive trace information"""
-    url = f"https://api.agentops.ai/public/v1/traces/{trace_id}"
-    headers = {"Authorization": f"Bearer {bearer_token}"}
-
-    response = requests.get(url, headers=headers)
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so that every helper reuses pooled keep-alive connections to
+# api.agentops.ai instead of paying a fresh DNS + TCP + TLS handshake per call.
+# Transient gateway errors are retried with backoff at the adapter level.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], allowed_methods=["GET", "POST"]
+        ),
+    ),
+)
+
+_API_BASE = "https://api.agentops.ai/public/v1"
+
+# (connect, read) timeout so a stuck backend fails fast instead of hanging the
+# test thread; fast failures also let the retry policy above kick in promptly.
+_TIMEOUT = (3.05, 10)
+
+try:
+    # ijson is an optional dependency; when present, large trace-details
+    # bodies are parsed incrementally off the socket instead of being
+    # buffered in full and then parsed again.
+    import ijson
+except ImportError:
+    ijson = None
+
+# Payloads smaller than this are cheaper to decode in one buffered pass.
+_STREAM_THRESHOLD = 256 * 1024
+
+
+def _request_json(method, url, error_label, bearer_token=None, session=None, **kwargs):
+    """Issue one API request and decode the JSON body.
+
+    All public getters funnel through here, so pooling, auth headers and (in
+    the future) retry or timeout policy live in a single place.
+    """
+    if session is None:
+        session = _SESSION
+    if bearer_token is not None and "Authorization" not in session.headers:
+        kwargs.setdefault("headers", {"Authorization": f"Bearer {bearer_token}"})
+    kwargs.setdefault("timeout", _TIMEOUT)
+    response = session.request(method, url, **kwargs)
     if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception(f"Failed to get trace details: {response.status_code} - {response.text}")
-
-
-def get_trace_metrics(bearer_token, trace_id):
+        return json_loads(response.content)
+    raise Exception(f"Failed to {error_label}: {response.status_code} - {response.text}")
+
+
+def _authorized_session(bearer_token):
+    """Build a session with the bearer header preset, sharing the common pool."""
+    session = requests.Session()
+    session.mount("https://", _SESSION.get_adapter("https://"))
+    session.headers.update({"Authorization": f"Bearer {bearer_token}"})
+    return session
+
+
+# Bearer tokens stay valid for many minutes, so cache them per API key and
+# skip the token-exchange round-trip when check_trace runs repeatedly.
+_TOKEN_CACHE: dict = {}
+_TOKEN_TTL_SECONDS = 900.0
+
+
+def get_bearer_token(api_key, session=None):
+    """Exchange API key for a bearer token, reusing a cached one when fresh"""
+    cached = _TOKEN_CACHE.get(api_key)
+    if cached is not None and time.monotonic() - cached[1] < _TOKEN_TTL_SECONDS:
+        return cached[0]
+
+    try:
+        data = _request_json(
+            "POST",
+            f"{_API_BASE}/auth/access_token",
+            "get bearer token",
+            session=session,
+            headers={"Content-Type": "application/json"},
+            json={"api_key": api_key},
+        )
+    except Exception:
+        _TOKEN_CACHE.pop(api_key, None)
+        raise
+    bearer = data["bearer"]
+    _TOKEN_CACHE[api_key] = (bearer, time.monotonic())
+    return bearer
+
+
+def get_trace_details(bearer_token, trace_id, session=None):
+    """Get comprehensive trace information
+
+    Long traces can carry span lists of tens of MB, so when ijson is
+    installed and the body is large (or of unknown size) it is parsed
+    incrementally while streaming, halving peak memory versus buffer-then-
+    parse. Small bodies and the no-ijson case use the buffered path.
+    """
+    url = f"{_API_BASE}/traces/{trace_id}"
+    if ijson is None:
+        return _request_json("GET", url, "get trace details", bearer_token=bearer_token, session=session)
+
+    if session is None:
+        session = _SESSION
+    headers = None if "Authorization" in session.headers else {"Authorization": f"Bearer {bearer_token}"}
+    with session.get(url, headers=headers, stream=True, timeout=_TIMEOUT) as response:
+        if response.status_code != 200:
+            raise Exception(f"Failed to get trace details: {response.status_code} - {response.text}")
+        content_length = int(response.headers.get("Content-Length") or 0)
+        if 0 < content_length < _STREAM_THRESHOLD:
+            return json_loads(response.content)
+        response.raw.decode_content = True  # undo any transport compression for ijson
+        return dict(ijson.kvitems(response.raw, ""))
+
+
+def get_trace_metrics(bearer_token, trace_id, session=None):
     """Get trace metrics and statistics"""
-    url = f"https://api.agentops.ai/public/v1/traces/{trace_id}/metrics"
-    headers = {"Authorization": f"Bearer {bearer_token}"}
-
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception(f"Failed to get trace metrics: {response.status_code} - {response.text}")
+    url = f"{_API_BASE}/traces/{trace_id}/metrics"
+    return _request_json("GET", url, "get trace metrics", bearer_token=bearer_token, session=session)
 
 
-def get_span_details(bearer_token, span_id):
+def get_span_details(bearer_token, span_id, session=None):
     """Get detailed span information"""
-    url = f"https://api.agentops.ai/public/v1/spans/{span_id}"
-    headers = {"Authorization": f"Bearer {bearer_token}"}
-
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception(f"Failed to get span details: {response.status_code} - {response.text}")
+    url = f"{_API_BASE}/spans/{span_id}"
+    return _request_json("GET", url, "get span details", bearer_token=bearer_token, session=session)
 
 
-def get_span_metrics(bearer_token, span_id):
+def get_span_metrics(bearer_token, span_id, session=None):
     """Get span metrics"""
-    url = f"https://api.agentops.ai/public/v1/spans/{span_id}/metrics"
-    headers = {"Authorization": f"Bearer {bearer_token}"}
-
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception(f"Failed to get span metrics: {response.status_code} - {response.text}")
+    url = f"{_API_BASE}/spans/{span_id}/metrics"
+    return _request_json("GET", url, "get span metrics", bearer_token=bearer_token, session=session)
 
 
 def get_trace_id(trace):
@@ -95,45 +166,70 @@ def check_trace(trace_id, api_key, span_names, delay_seconds=10):
         trace_id: The ID of the trace to check
         api_key: The API key for authentication
         span_names: List of span names to check
-        delay_seconds: Delay before checking the trace details
+        delay_seconds: Upper bound on how long to poll for the trace details
     """
     print_separator("TRACE VERIFICATION STARTING", Colors.GREEN)
-    print(f"{Colors.YELLOW}Waiting {delay_seconds} seconds before checking trace details...{Colors.ENDC}")
-    time.sleep(delay_seconds)
 
     # Get bearer token
     print(f"{Colors.BLUE}Getting bearer token...{Colors.ENDC}")
     bearer_token = get_bearer_token(api_key)
     assert bearer_token is not None
     print(f"{Colors.GREEN}Bearer token obtained{Colors.ENDC}")
+    session = _authorized_session(bearer_token)
 
-    # Get trace details
+    # Poll for the trace with backoff instead of sleeping a fixed delay, so
+    # verification proceeds as soon as the backend has ingested all spans.
     print_separator("TRACE DETAILS", Colors.HEADER)
-    trace_details = get_trace_details(bearer_token, trace_id)
+    print(f"{Colors.YELLOW}Polling trace details for up to {delay_seconds * 3} seconds...{Colors.ENDC}")
+    wanted_names = set(span_names)
+    trace_details = poll_until(
+        lambda: get_trace_details(bearer_token, trace_id, session=session),
+        lambda details: wanted_names <= {span.get("span_name") for span in details.get("spans", [])},
+        timeout=delay_seconds * 3,
+    )
     assert trace_details is not None
     print_section("Retrieved trace details for trace", trace_details)
 
-    # Get trace metrics
-    print_separator("TRACE METRICS", Colors.HEADER)
-    trace_metrics = get_trace_metrics(bearer_token, trace_id)
-    assert trace_metrics is not None
-    print_section("Retrieved trace metrics", trace_metrics)
-
-    # Get details for chat completion span
-    print_separator("SPAN ANALYSIS", Colors.HEADER)
-    trace_spans = trace_details.get("spans", [])
-    for span_name in span_names:
-        spans = [span for span in trace_spans if span.get("span_name") == span_name]
-        assert len(spans) > 0, f"No spans found for {span_name}"
-
-        print(f"{Colors.GREEN}{Colors.BOLD}Analyzing spans for: {span_name}{Colors.ENDC}")
-        print_section(f"Spans for {span_name}", spans)
-
-        for i, span in enumerate(spans, 1):
-            print(f"{Colors.YELLOW}{Colors.BOLD}Span {i}/{len(spans)} - ID: {span['span_id']}{Colors.ENDC}")
-            details = get_span_details(bearer_token, span["span_id"])
-            assert details is not None
-            print_section("Span Details", details)
-            print_separator("", Colors.BLUE)
+    # The remaining calls are independent I/O waits on the remote API, so fan
+    # them out on a small thread pool and only serialize the printing.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        metrics_future = executor.submit(get_trace_metrics, bearer_token, trace_id, session=session)
+
+        # Get trace metrics
+        print_separator("TRACE METRICS", Colors.HEADER)
+        trace_metrics = metrics_future.result()
+        assert trace_metrics is not None
+        print_section("Retrieved trace metrics", trace_metrics)
+
+        # Get details for chat completion span
+        print_separator("SPAN ANALYSIS", Colors.HEADER)
+        trace_spans = trace_details.get("spans", [])
+        # Bucket the spans by name in one pass instead of re-scanning the full
+        # span list for every requested name.
+        spans_by_name = {}
+        for span in trace_spans:
+            spans_by_name.setdefault(span.get("span_name"), []).append(span)
+        matched_spans = {}
+        for span_name in span_names:
+            spans = spans_by_name.get(span_name, [])
+            assert spans, f"No spans found for {span_name}"
+            matched_spans[span_name] = spans
+
+        detail_futures = {
+            span["span_id"]: executor.submit(get_span_details, bearer_token, span["span_id"], session=session)
+            for spans in matched_spans.values()
+            for span in spans
+        }
+
+        for span_name, spans in matched_spans.items():
+            print(f"{Colors.GREEN}{Colors.BOLD}Analyzing spans for: {span_name}{Colors.ENDC}")
+            print_section(f"Spans for {span_name}", spans)
+
+            for i, span in enumerate(spans, 1):
+                print(f"{Colors.YELLOW}{Colors.BOLD}Span {i}/{len(spans)} - ID: {span['span_id']}{Colors.ENDC}")
+                details = detail_futures[span["span_id"]].result()
+                assert details is not None
+                print_section("Span Details", details)
+                print_separator("", Colors.BLUE)
 
     print_separator("TRACE VERIFICATION COMPLETED", Colors.GREEN)
@@ -1,3 +1,19 @@
+import os
+import sys
+import time
+
+try:
+    # orjson is an optional dependency; when present it parses the larger
+    # trace and completion payloads several times faster than stdlib json.
+    import orjson as _orjson
+
+    json_loads = _orjson.loads
+except ImportError:
+    import json as _json
+
+    json_loads = _json.loads
+
+
 # ANSI color codes for colorized output
 class Colors:
     HEADER = "\033[95m"
@@ -11,6 +27,13 @@ class Colors:
     UNDERLINE = "\033[4m"
 
 
+# When stdout is redirected (CI logs) the escape codes are pure noise, so
+# blank them out once at import. NO_COLOR is the conventional opt-out.
+if not sys.stdout.isatty() or os.environ.get("NO_COLOR"):
+    for _attr in [name for name in vars(Colors) if not name.startswith("__")]:
+        setattr(Colors, _attr, "")
+
+
 def print_separator(title="", color=Colors.CYAN):
     """Print a colorized separator with optional title"""
     separator = "=" * 80
@@ -27,3 +50,32 @@ def print_section(title, content):
     print(f"{Colors.BLUE}{Colors.BOLD}{title}:{Colors.ENDC}")
     print(content)
     print()
+
+
+def poll_until(fn, predicate, timeout=30.0, initial=0.2, factor=1.6):
+    """Call `fn` with exponential backoff until `predicate(result)` is truthy.
+
+    Returns as soon as the predicate accepts a result, instead of sleeping a
+    fixed delay and hoping the backend has caught up. Exceptions from `fn`
+    (backends commonly 404 until a trace is ingested) are swallowed while time
+    remains. When the timeout expires, the last result is returned so the
+    caller's own assertions can produce a meaningful failure; if the last
+    attempt raised, that exception is re-raised instead.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        try:
+            result = fn()
+            error = None
+            if predicate(result):
+                return result
+        except Exception as exc:
+            result = None
+            error = exc
+        if time.monotonic() + delay > deadline:
+            if error is not None:
+                raise error
+            return result
+        time.sleep(delay)
+        delay *= factor
@@ -1,18 +1,14 @@
 import asyncio
 import json
-import os
 
 from common_utils import print_section
 from mcp import ClientSession, types
 from mcp.client.sse import sse_client
-from openai import OpenAI
+from openai_utils import get_openai_client
 
 import poml
 
-client = OpenAI(
-    base_url=os.environ["OPENAI_API_BASE"],
-    api_key=os.environ["OPENAI_API_KEY"],
-)
+client = get_openai_client()
 
 
 async def main():
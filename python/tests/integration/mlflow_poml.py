@@ -1,9 +1,7 @@
-import os
-
 import mlflow
 import mlflow.openai
 from mlflow_utils import check_prompt, check_trace
-from openai import OpenAI
+from openai_utils import get_openai_client
 
 import poml
 
@@ -15,10 +13,7 @@ if __name__ == "__main__":
 
     mlflow.openai.autolog()
 
-    client = OpenAI(
-        base_url=os.environ["OPENAI_API_BASE"],
-        api_key=os.environ["OPENAI_API_KEY"],
-    )
+    client = get_openai_client()
 
     messages = poml.poml("../assets/explain_code.poml", context={"code_path": "sample.py"}, format="openai_chat")
     print("POML messages:", messages)
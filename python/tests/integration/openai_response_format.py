@@ -1,24 +1,25 @@
-import os
+import asyncio
 
-from common_utils import print_section
-from flask import json
-from openai import OpenAI
+from common_utils import json_loads, print_section
+from openai_utils import get_async_openai_client
 
 import poml
 
-if __name__ == "__main__":
-    client = OpenAI(
-        base_url=os.environ["OPENAI_API_BASE"],
-        api_key=os.environ["OPENAI_API_KEY"],
-    )
+
+async def main():
+    client = get_async_openai_client()
 
     params = poml.poml("../assets/response_format.poml", format="openai_chat")
     print_section("Parameters", str(params))
     assert "response_format" in params
-    response = client.chat.completions.create(model="gpt-4.1-nano", **params)
+    response = await client.chat.completions.create(model="gpt-4.1-nano", **params)
     print_section("Response Choice", str(response.choices[0]))
-    result = json.loads(response.choices[0].message.content)
+    result = json_loads(response.choices[0].message.content)
     print_section("Parsed Result", str(result))
     assert "name" in result
     assert "date" in result
     assert isinstance(result["participants"], list)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
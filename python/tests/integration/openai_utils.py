@@ -0,0 +1,32 @@
+"""Shared OpenAI client construction for the integration scripts."""
+
+import functools
+import os
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+# A modest keep-alive pool lets scripts imported into the same pytest process
+# share warm connections instead of rebuilding a client (and its TLS state)
+# per script.
+_LIMITS = httpx.Limits(max_keepalive_connections=10)
+
+
+@functools.lru_cache(maxsize=1)
+def get_openai_client():
+    """Build the synchronous client once per process; env is read on first use."""
+    return OpenAI(
+        base_url=os.environ["OPENAI_API_BASE"],
+        api_key=os.environ["OPENAI_API_KEY"],
+        http_client=DefaultHttpxClient(limits=_LIMITS),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_async_openai_client():
+    """Async counterpart of get_openai_client with the same shared pool limits."""
+    return AsyncOpenAI(
+        base_url=os.environ["OPENAI_API_BASE"],
+        api_key=os.environ["OPENAI_API_KEY"],
+        http_client=DefaultAsyncHttpxClient(limits=_LIMITS),
+    )
@@ -1,17 +1,15 @@
-import os
+import functools
 from datetime import datetime, timedelta, timezone
 
 import weave
-from openai import OpenAI
+from openai_utils import get_openai_client
 from weave_utils import check_trace
 
-if __name__ == "__main__":
-    weave.init("poml_baseline")
-
-    # Set time cutoff to current time (timezone-aware) to capture only this run's traces
-    time_cutoff = datetime.now(timezone.utc) - timedelta(seconds=30)
-    print(f"Time cutoff (UTC): {time_cutoff.isoformat()}")
 
+@functools.lru_cache(maxsize=1)
+def get_emotion_prompt():
+    """Build and publish the prompt once; harnesses looping over scenes reuse
+    the handle instead of re-sending the identical prompt every iteration."""
     prompt = weave.MessagesPrompt(
         [
             {
@@ -22,17 +20,27 @@ if __name__ == "__main__":
         ]
     )
     weave.publish(prompt, name="emotion_prompt")
+    return prompt
 
-    client = OpenAI(
-        base_url=os.environ["OPENAI_API_BASE"],
-        api_key=os.environ["OPENAI_API_KEY"],
-    )
 
-    response = client.chat.completions.create(
+def run_scene(client, scene):
+    """The per-scene hot path: only the completion call, no publishing."""
+    return client.chat.completions.create(
         model="gpt-4.1-nano",
-        messages=prompt.format(scene="A dog is lying on a dock next to a fisherman."),
+        messages=get_emotion_prompt().format(scene=scene),
     )
 
+
+if __name__ == "__main__":
+    weave.init("poml_baseline")
+
+    # Set time cutoff to current time (timezone-aware) to capture only this
+    # run's traces; computed once up front, outside the per-scene path.
+    time_cutoff = datetime.now(timezone.utc) - timedelta(seconds=30)
+    print(f"Time cutoff (UTC): {time_cutoff.isoformat()}")
+
+    client = get_openai_client()
+    response = run_scene(client, "A dog is lying on a dock next to a fisherman.")
     print("Response:", response.choices[0].message.content)
 
     prompt_ref = weave.get("emotion_prompt")
@@ -1,8 +1,7 @@
-import os
 from datetime import datetime, timezone
 
 import weave
-from openai import OpenAI
+from openai_utils import get_openai_client
 from weave_utils import check_prompt, check_trace
 
 import poml
@@ -19,10 +18,7 @@ if __name__ == "__main__":
     messages = poml.poml("../assets/explain_code.poml", context={"code_path": "sample.py"}, format="openai_chat")
     print("POML messages:", messages)
 
-    client = OpenAI(
-        base_url=os.environ["OPENAI_API_BASE"],
-        api_key=os.environ["OPENAI_API_KEY"],
-    )
+    client = get_openai_client()
 
     response = client.chat.completions.create(model="gpt-4.1-nano", **messages)
 
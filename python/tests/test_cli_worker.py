@@ -0,0 +1,43 @@
+from poml import clear_trace
+from poml import cli as poml_cli
+from poml import poml, set_trace
+
+
+def test_worker_reuse():
+    """Consecutive calls are served by one persistent Node process."""
+    assert poml("<p>First</p>") == [{"speaker": "human", "content": "First"}]
+    process = poml_cli._worker._process
+    assert process is not None and process.poll() is None
+    assert poml("<p>Second</p>") == [{"speaker": "human", "content": "Second"}]
+    assert poml_cli._worker._process is process
+
+
+def test_worker_respawns_after_terminate():
+    poml("<p>Warm</p>")
+    poml_cli._worker.terminate()
+    assert poml("<p>Back</p>") == [{"speaker": "human", "content": "Back"}]
+
+
+def test_one_shot_fallback(monkeypatch):
+    """A CLI without --server support falls back to a one-shot invocation."""
+
+    def unavailable(self, *args):
+        raise poml_cli.CliServerUnavailable("forced for test")
+
+    monkeypatch.setattr(poml_cli._PomlWorker, "request", unavailable)
+    assert poml("<p>Fallback</p>") == [{"speaker": "human", "content": "Fallback"}]
+
+
+def test_no_trace_leak_after_disable(tmp_path):
+    """Disabling tracing must also stop the persistent worker from dumping."""
+    clear_trace()
+    run_dir = set_trace(True, trace_dir=tmp_path)
+    poml("<p>Traced</p>")
+    traced_files = set(run_dir.glob("*.poml"))
+    # One traced call dumps the markup plus its .source.poml link.
+    assert len(traced_files) == 2
+    set_trace(False)
+    poml("<p>Untraced</p>")
+    # The untraced call on the same worker process must not add to the run
+    # directory.
+    assert set(run_dir.glob("*.poml")) == traced_files